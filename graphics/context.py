@@ -0,0 +1,246 @@
+# graphics/context.py
+"""
+Plotting context with precomputed geometry.
+
+PlotContext is built once for a given grid (x, y) and caches everything
+that does not depend on the solution: the meshgrid, the image extent,
+color normalizations and streamline seed points. It also provides a fast
+raster path (imshow on uniform grids, pcolormesh otherwise) whose artists
+are updated in place with set_data / set_array, which is much cheaper
+than redrawing contourf on large grids.
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import Normalize
+from matplotlib.image import AxesImage
+from matplotlib.animation import FuncAnimation
+
+
+def _widen(norm, field):
+    # Extend the limits of a Normalize to cover field
+    lo, hi = float(np.min(field)), float(np.max(field))
+    norm.vmin = lo if norm.vmin is None else min(norm.vmin, lo)
+    norm.vmax = hi if norm.vmax is None else max(norm.vmax, hi)
+
+
+class PlotContext:
+    """
+    Cached plotting geometry for a rectangular grid.
+
+    Parameters
+    ----------
+    x, y : 1D arrays
+        Grid coordinates
+    """
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.nx = self.x.size
+        self.ny = self.y.size
+
+        self.extent = (self.x[0], self.x[-1], self.y[0], self.y[-1])
+        self.uniform = (np.allclose(np.diff(self.x), self.x[1] - self.x[0]) and
+                        np.allclose(np.diff(self.y), self.y[1] - self.y[0]))
+
+        self._mesh = None
+        self._norms = {}
+        self._seeds = {}
+        self._speed = np.empty((self.ny, self.nx))
+
+    @property
+    def mesh(self):
+        """
+        (X, Y) meshgrid, built on first use.
+        """
+        if self._mesh is None:
+            self._mesh = np.meshgrid(self.x, self.y)
+        return self._mesh
+
+    def speed(self, u, v, out=None):
+        """
+        Velocity magnitude. Written into a reused buffer unless out is given,
+        so copy the result if it has to outlive the next call.
+        """
+        if out is None:
+            out = self._speed
+        return np.hypot(u, v, out=out)
+
+    def norm(self, name, *fields):
+        """
+        Return cached Normalize for `name`, widened to cover `fields`.
+
+        The cached limits only ever grow, so they can be shared by several
+        plots of the same run. Call reset_norms() before plotting another run.
+
+        Parameters
+        ----------
+        name : str
+            Key of the normalization, e.g. "speed" or "p"
+        fields : 2D arrays
+            Data the normalization has to cover
+
+        Returns
+        -------
+        norm : matplotlib.colors.Normalize
+        """
+        norm = self._norms.get(name)
+        if norm is None:
+            norm = Normalize()
+            self._norms[name] = norm
+
+        for f in fields:
+            _widen(norm, f)
+        return norm
+
+    def reset_norms(self):
+        """
+        Forget all cached color normalizations.
+        """
+        self._norms.clear()
+
+    def seed_points(self, n=20):
+        """
+        Return an (n*n, 2) array of streamline seed points covering the
+        interior of the domain. Cached per n.
+        """
+        seeds = self._seeds.get(n)
+        if seeds is None:
+            xs = np.linspace(self.x[0], self.x[-1], n + 2)[1:-1]
+            ys = np.linspace(self.y[0], self.y[-1], n + 2)[1:-1]
+            SX, SY = np.meshgrid(xs, ys)
+            seeds = np.column_stack([SX.ravel(), SY.ravel()])
+            self._seeds[n] = seeds
+        return seeds
+
+    def raster(self, ax, field, cmap="viridis", norm=None):
+        """
+        Draw a field as a raster image.
+
+        Uses imshow on uniform grids and pcolormesh otherwise. The returned
+        artist can be updated with PlotContext.update().
+        """
+        if self.uniform:
+            return ax.imshow(field, origin="lower", extent=self.extent,
+                             cmap=cmap, norm=norm, interpolation="nearest",
+                             aspect="auto")
+        X, Y = self.mesh
+        return ax.pcolormesh(X, Y, field, cmap=cmap, norm=norm, shading="nearest")
+
+    @staticmethod
+    def update(artist, field):
+        """
+        Replace the data of an artist created by raster().
+        """
+        if isinstance(artist, AxesImage):
+            artist.set_data(field)
+        else:
+            artist.set_array(field)
+
+    def plot_fields(self, u, v, p, time=None, save=False, filename=None, show=True):
+        """
+        Raster version of graphics.plots.plot_fields.
+
+        Parameters
+        ----------
+        u, v : 2D arrays
+            Velocity components
+        p : 2D array
+            Pressure field
+        time : float, optional
+            Simulation time
+        save : bool
+            Save figure to file
+        filename : str, optional
+            Output filename
+        show : bool
+            Call plt.show() at the end
+
+        Returns
+        -------
+        fig : matplotlib.figure.Figure
+        """
+        fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+
+        im1 = self.raster(axes[0], self.speed(u, v), cmap="viridis")
+        axes[0].set_title("Velocity magnitude")
+        axes[0].set_xlabel("x")
+        axes[0].set_ylabel("y")
+        fig.colorbar(im1, ax=axes[0])
+
+        im2 = self.raster(axes[1], p, cmap="coolwarm")
+        axes[1].set_title("Pressure")
+        axes[1].set_xlabel("x")
+        axes[1].set_ylabel("y")
+        fig.colorbar(im2, ax=axes[1])
+
+        if time is not None:
+            fig.suptitle(f"Time = {time:.3f}")
+
+        fig.tight_layout()
+
+        if save:
+            if filename is None:
+                filename = "cavity_snapshot.png"
+            fig.savefig(filename, dpi=300)
+
+        if show:
+            plt.show()
+        return fig
+
+    def animate_fields(self, u_hist, v_hist, p_hist, interval=50,
+                       save=False, filename="contours.mp4", show=True,
+                       shared_limits=False):
+        """
+        Raster version of graphics.animations.animate_contours.
+
+        Color limits are fixed over the whole history, so frames are
+        comparable and each update is a single set_data call.
+
+        Parameters
+        ----------
+        shared_limits : bool
+            Widen and use the cached norms of this context (see norm()),
+            e.g. to give animations of the same run equal color scales.
+            By default the limits are taken from this history only.
+
+        Returns
+        -------
+        anim : matplotlib.animation.FuncAnimation
+        """
+        if shared_limits:
+            speed_norm, p_norm = self.norm("speed"), self.norm("p")
+        else:
+            speed_norm, p_norm = Normalize(), Normalize()
+
+        # speed() reuses one buffer, so widen the norm frame by frame
+        for u, v, p in zip(u_hist, v_hist, p_hist):
+            _widen(speed_norm, self.speed(u, v))
+            _widen(p_norm, p)
+
+        fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+
+        im1 = self.raster(axes[0], self.speed(u_hist[0], v_hist[0]),
+                          cmap="viridis", norm=speed_norm)
+        im2 = self.raster(axes[1], p_hist[0], cmap="coolwarm", norm=p_norm)
+        fig.colorbar(im1, ax=axes[0])
+        fig.colorbar(im2, ax=axes[1])
+
+        axes[0].set_title("Velocity magnitude")
+        axes[1].set_title("Pressure")
+
+        def update(frame):
+            self.update(im1, self.speed(u_hist[frame], v_hist[frame]))
+            self.update(im2, p_hist[frame])
+            return im1, im2
+
+        anim = FuncAnimation(fig, update, frames=len(u_hist),
+                             interval=interval, blit=True)
+
+        if save:
+            anim.save(filename, dpi=200)
+
+        if show:
+            plt.show()
+        return anim
@@ -1,8 +1,8 @@
-import numpy as np
 import matplotlib.pyplot as plt
+from graphics.context import PlotContext
 
 
-def plot_fields(x, y, u, v, p, time=None, save=False, filename=None):
+def plot_fields(x, y, u, v, p, time=None, save=False, filename=None, ctx=None):
     """
     Plot velocity magnitude and pressure contours.
 
@@ -20,10 +20,14 @@ def plot_fields(x, y, u, v, p, time=None, save=False, filename=None):
         Save figure to file
     filename : str, optional
         Output filename
+    ctx : PlotContext, optional
+        Cached grid geometry, reused between calls
     """
 
-    X, Y = np.meshgrid(x, y)
-    speed = np.sqrt(u**2 + v**2)
+    if ctx is None:
+        ctx = PlotContext(x, y)
+    X, Y = ctx.mesh
+    speed = ctx.speed(u, v)
 
     fig, axes = plt.subplots(1, 2, figsize=(12, 5))
 
@@ -53,7 +57,7 @@ def plot_fields(x, y, u, v, p, time=None, save=False, filename=None):
 
     plt.show()
 
-def plot_velocity_vectors(x, y, u, v, stride=2, scale=None):
+def plot_velocity_vectors(x, y, u, v, stride=2, scale=None, ctx=None):
     """
     Plot velocity vector field using quiver.
 
@@ -67,9 +71,13 @@ def plot_velocity_vectors(x, y, u, v, stride=2, scale=None):
         Plot every `stride` grid point (for clarity)
     scale : float, optional
         Quiver scaling
+    ctx : PlotContext, optional
+        Cached grid geometry, reused between calls
     """
 
-    X, Y = np.meshgrid(x, y)
+    if ctx is None:
+        ctx = PlotContext(x, y)
+    X, Y = ctx.mesh
 
     plt.figure(figsize=(6, 6))
     plt.quiver(
@@ -86,7 +94,7 @@ def plot_velocity_vectors(x, y, u, v, stride=2, scale=None):
     plt.axis("equal")
     plt.show()
 
-def plot_streamlines(x, y, u, v, density=1.5):
+def plot_streamlines(x, y, u, v, density=1.5, seeds=None, ctx=None):
     """
     Plot streamlines of velocity field.
 
@@ -98,10 +106,18 @@ def plot_streamlines(x, y, u, v, density=1.5):
         Velocity components
     density : float
         Controls streamline density
+    seeds : int, optional
+        If given, start streamlines from a cached seeds x seeds grid
+        of points instead of matplotlib's automatic placement
+    ctx : PlotContext, optional
+        Cached grid geometry, reused between calls
     """
 
-    X, Y = np.meshgrid(x, y)
-    speed = np.sqrt(u**2 + v**2)
+    if ctx is None:
+        ctx = PlotContext(x, y)
+    X, Y = ctx.mesh
+    speed = ctx.speed(u, v)
+    start_points = ctx.seed_points(seeds) if seeds is not None else None
 
     plt.figure(figsize=(6, 6))
     plt.streamplot(
@@ -109,7 +125,8 @@ def plot_streamlines(x, y, u, v, density=1.5):
         color=speed,
         cmap="viridis",
         density=density,
-        linewidth=1
+        linewidth=1,
+        start_points=start_points
     )
 
     plt.colorbar(label="Velocity magnitude")
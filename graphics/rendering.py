@@ -0,0 +1,340 @@
+# graphics/rendering.py
+"""
+Off-screen rendering of solution histories to video.
+
+Frames are read lazily (from a directory of .npz files or from any
+iterable/generator), decimated in time and space, rendered in parallel
+worker processes on a non-interactive Agg canvas and piped directly
+into ffmpeg. Nothing is shown on screen, so this works headless.
+"""
+
+import os
+import glob
+import shutil
+import subprocess
+import multiprocessing as mp
+
+import numpy as np
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from graphics.context import PlotContext
+
+
+def save_frames(directory, u_hist, v_hist, p_hist, prefix="frame"):
+    """
+    Write a solution history to disk, one compressed .npz file per frame.
+
+    Parameters
+    ----------
+    directory : str
+        Output directory (created if missing)
+    u_hist, v_hist, p_hist : iterable of 2D arrays
+        Velocity and pressure history
+    prefix : str
+        File name prefix
+
+    Returns
+    -------
+    paths : list of str
+        Paths of the written frame files, in order
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i, (u, v, p) in enumerate(zip(u_hist, v_hist, p_hist)):
+        path = os.path.join(directory, f"{prefix}_{i:06d}.npz")
+        np.savez_compressed(path, u=u, v=v, p=p)
+        paths.append(path)
+    return paths
+
+
+def frame_files(directory, prefix="frame"):
+    """
+    Return sorted list of frame files written by save_frames().
+    Files are only listed here, they are loaded by the render workers.
+    """
+    return sorted(glob.glob(os.path.join(directory, f"{prefix}_*.npz")))
+
+
+def load_frame(frame):
+    """
+    Return (u, v, p) for a frame given either as a file path or as a tuple.
+    """
+    if isinstance(frame, (str, os.PathLike)):
+        with np.load(frame) as data:
+            return data["u"], data["v"], data["p"]
+    u, v, p = frame
+    return u, v, p
+
+
+def decimate_time(frames, n_frames, n_total=None):
+    """
+    Lazily pick about n_frames evenly spaced frames out of a frame source.
+
+    Parameters
+    ----------
+    frames : iterable
+        Frame source (list, generator, list of file paths, ...)
+    n_frames : int or None
+        Target number of frames. None keeps every frame.
+    n_total : int, optional
+        Length of the source. Needed only if frames has no len().
+
+    Yields
+    ------
+    frame
+        Selected items of frames, in order
+    """
+    if n_frames is None:
+        yield from frames
+        return
+
+    if n_total is None:
+        try:
+            n_total = len(frames)
+        except TypeError:
+            raise ValueError("n_total must be given for sources without len()")
+    if n_frames < 1:
+        raise ValueError(f"n_frames must be at least 1, got {n_frames}")
+    if n_total < 1:
+        raise ValueError(f"n_total must be at least 1, got {n_total}")
+
+    keep = set(np.unique(np.linspace(0, n_total - 1, n_frames).round().astype(int)).tolist())
+    last = max(keep)
+    for i, frame in enumerate(frames):
+        if i in keep:
+            yield frame
+        if i >= last:
+            break
+
+
+def spatial_stride(nx, ny, resolution):
+    """
+    Stride needed so that neither grid direction exceeds `resolution` points.
+    """
+    if resolution is None:
+        return 1
+    return max(1, int(np.ceil(max(nx, ny) / resolution)))
+
+
+# Per-process render state, set up once by _init_worker
+_WORKER = {}
+
+
+def _init_worker(x, y, stride, figsize, dpi, levels, method):
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    axes = fig.subplots(1, 2)
+    ctx = PlotContext(x[::stride], y[::stride])
+
+    _WORKER.update(fig=fig, canvas=canvas, axes=axes, ctx=ctx, stride=stride,
+                   n_levels=levels, method=method, limits=None)
+
+
+def _set_limits(limits):
+    # Fixed color scales, so colors are comparable between frames.
+    # Called once per worker, with the first frame.
+    w = _WORKER
+    fig, axes, ctx = w["fig"], w["axes"], w["ctx"]
+    norms = tuple(Normalize(*_nondegenerate(*limits[name])) for name in ("speed", "p"))
+    cmaps = ("viridis", "coolwarm")
+
+    if w["method"] == "raster":
+        blank = np.zeros((ctx.ny, ctx.nx))
+        artists = tuple(ctx.raster(ax, blank, cmap=cmap, norm=norm)
+                        for ax, cmap, norm in zip(axes, cmaps, norms))
+        contour_levels = None
+    else:
+        artists = None
+        contour_levels = tuple(np.linspace(norm.vmin, norm.vmax, w["n_levels"])
+                               for norm in norms)
+
+    for ax, cmap, norm in zip(axes, cmaps, norms):
+        fig.colorbar(ScalarMappable(norm=norm, cmap=cmap), ax=ax)
+    axes[0].set_title("Velocity magnitude")
+    axes[1].set_title("Pressure")
+
+    w.update(limits=limits, artists=artists, levels=contour_levels,
+             norms=norms, cmaps=cmaps)
+
+
+def _nondegenerate(vmin, vmax):
+    # Constant fields (e.g. p = 0) still need an increasing color range
+    if vmax > vmin:
+        return vmin, vmax
+    return vmin - 0.5, vmin + 0.5
+
+
+def _load_strided(frame):
+    s = _WORKER["stride"]
+    u, v, p = load_frame(frame)
+    return u[::s, ::s], v[::s, ::s], p[::s, ::s]
+
+
+def _frame_limits(frame):
+    u, v, p = _load_strided(frame)
+    speed = _WORKER["ctx"].speed(u, v)
+    return float(speed.min()), float(speed.max()), float(p.min()), float(p.max())
+
+
+def _render_frame(task):
+    frame, limits = task
+    w = _WORKER
+    if w["limits"] != limits:
+        _set_limits(limits)
+
+    u, v, p = _load_strided(frame)
+    ctx = w["ctx"]
+    speed = ctx.speed(u, v)
+
+    if w["artists"] is not None:
+        # Raster path: update the existing images in place, limits stay fixed
+        for artist, field in zip(w["artists"], (speed, p)):
+            ctx.update(artist, field)
+    else:
+        # Contour path: redraw with the same levels every frame
+        X, Y = ctx.mesh
+        for ax, field, levels, cmap, norm, title in zip(
+                w["axes"], (speed, p), w["levels"], w["cmaps"], w["norms"],
+                ("Velocity magnitude", "Pressure")):
+            ax.clear()
+            ax.contourf(X, Y, field, levels=levels, cmap=cmap, norm=norm, extend="both")
+            ax.set_title(title)
+
+    w["canvas"].draw()
+    width, height = w["canvas"].get_width_height()
+    return width, height, bytes(w["canvas"].buffer_rgba())
+
+
+def _color_limits(frame_limits):
+    """
+    Reduce per-frame (speed min, speed max, p min, p max) to overall limits.
+    """
+    frame_limits = np.array(list(frame_limits)).reshape(-1, 4)
+    if len(frame_limits) == 0:
+        return {"speed": (0.0, 1.0), "p": (0.0, 1.0)}
+    lo = frame_limits.min(axis=0)
+    hi = frame_limits.max(axis=0)
+    return {"speed": (float(lo[0]), float(hi[1])), "p": (float(lo[2]), float(hi[3]))}
+
+
+def _ffmpeg_command(filename, width, height, fps):
+    return [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-vcodec", "rawvideo",
+        "-s", f"{width}x{height}", "-pix_fmt", "rgba", "-r", str(fps),
+        "-i", "-",
+        "-an", "-vcodec", "libx264", "-pix_fmt", "yuv420p",
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        filename,
+    ]
+
+
+def render_contours(x, y, frames, filename="contours.mp4",
+                    n_frames=None, n_total=None, resolution=None,
+                    fps=25, workers=None, levels=20,
+                    figsize=(12, 5), dpi=100, method="contourf",
+                    speed_range=None, p_range=None):
+    """
+    Render velocity magnitude and pressure contours off-screen to a video.
+
+    Parameters
+    ----------
+    x, y : 1D arrays
+        Grid coordinates
+    frames : iterable
+        Either (u, v, p) tuples (list or generator) or paths to .npz
+        frame files (see save_frames / frame_files). Paths are loaded
+        inside the workers, so the main process never holds the history.
+    filename : str
+        Output video file
+    n_frames : int, optional
+        Target number of frames in the video (time decimation)
+    n_total : int, optional
+        Number of frames in the source, if it has no len()
+    resolution : int, optional
+        Maximum number of grid points per direction (space decimation)
+    fps : int
+        Frames per second of the output video
+    workers : int, optional
+        Number of render processes. Defaults to os.cpu_count().
+        With workers=1 everything is rendered in-process.
+    levels : int
+        Number of contour levels
+    figsize : tuple
+        Figure size in inches
+    dpi : int
+        Figure resolution
+    method : str
+        "contourf" or "raster". The raster path (imshow/pcolormesh, see
+        graphics.context) is much faster on large grids.
+    speed_range, p_range : (vmin, vmax), optional
+        Fixed color limits (and contour level range) of all frames. If not
+        given they are taken from a first pass over the selected frames,
+        which needs a re-iterable source (list of tuples or file paths);
+        a generator source must pass both ranges.
+
+    Returns
+    -------
+    n_written : int
+        Number of frames written to the video
+    """
+    if method not in ("contourf", "raster"):
+        raise ValueError("method must be 'contourf' or 'raster'")
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg executable not found on PATH")
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+    stride = spatial_stride(len(x), len(y), resolution)
+
+    find_limits = speed_range is None or p_range is None
+    if find_limits and iter(frames) is frames:
+        raise ValueError("speed_range and p_range are required "
+                         "for a generator source")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    init_args = (x, y, stride, figsize, dpi, levels, method)
+
+    if workers > 1:
+        pool = mp.Pool(workers, initializer=_init_worker, initargs=init_args)
+        imap = pool.imap
+    else:
+        pool = None
+        _init_worker(*init_args)
+        imap = lambda func, items, chunksize: map(func, items)
+
+    proc = None
+    n_written = 0
+    try:
+        if find_limits:
+            # First pass: per-frame min/max, loaded and reduced in the workers
+            found = _color_limits(imap(_frame_limits, decimate_time(frames, n_frames, n_total),
+                                       chunksize=4))
+            speed_range = speed_range or found["speed"]
+            p_range = p_range or found["p"]
+        limits = {"speed": tuple(speed_range), "p": tuple(p_range)}
+
+        selected = decimate_time(frames, n_frames, n_total)
+        rendered = imap(_render_frame, ((frame, limits) for frame in selected), chunksize=2)
+
+        for width, height, buf in rendered:
+            if proc is None:
+                proc = subprocess.Popen(_ffmpeg_command(filename, width, height, fps),
+                                        stdin=subprocess.PIPE)
+            proc.stdin.write(buf)
+            n_written += 1
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if proc is not None:
+            proc.stdin.close()
+            proc.wait()
+
+    if proc is not None and proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with code {proc.returncode}")
+
+    return n_written
@@ -0,0 +1,293 @@
+# methods/diagnostics.py
+"""
+On-the-fly diagnostics for the cavity solver.
+
+Reducers are called by the solver every `every` steps with the current
+fields and keep compact time series (or running statistics) of derived
+quantities, so the full field history does not have to be stored.
+
+Usage:
+    reducers = [KineticEnergy(), WallShearStress(every=10), TimeAverage(start=500)]
+    results = solve_cavity(domain, fluid, BC, dt, t_final, diagnostics=reducers)
+    results["diagnostics"]["kinetic_energy"]["value"]
+"""
+
+import numpy as np
+
+
+def vorticity(u, v, dx, dy):
+    """
+    Compute vorticity w = dv/dx - du/dy with central differences
+    (one-sided at the boundaries).
+    """
+    return np.gradient(v, dx, axis=1) - np.gradient(u, dy, axis=0)
+
+
+def stream_function(u, dy):
+    """
+    Compute stream function by integrating psi_y = u from the bottom wall
+    (trapezoidal rule). psi = 0 on the bottom wall.
+    """
+    psi = np.zeros_like(u)
+    psi[1:, :] = np.cumsum(0.5 * (u[1:, :] + u[:-1, :]) * dy, axis=0)
+    return psi
+
+
+def momentum_residual(u, v, p, rho, nu, dx, dy, dudt=0.0, dvdt=0.0, margin=2):
+    """
+    Relative residual of the momentum balance,
+    |grad p - F| / |F| with F = -rho (u.grad)u + rho nu ∇²u - rho du/dt,
+    over the points at least `margin` cells away from the walls
+    (central differences). Checks that a pressure field belongs to a
+    velocity field: 0 for an exact pair, 1 for p = 0.
+
+    Parameters
+    ----------
+    u, v, p : 2D ndarray
+        Velocity and pressure fields
+    rho, nu : float
+        Density and kinematic viscosity
+    dx, dy : float
+        Grid spacing
+    dudt, dvdt : float or 2D ndarray
+        Time derivative of the velocity, zero for steady flow
+    margin : int
+        Number of grid points left out next to each wall
+
+    Returns
+    -------
+    float
+    """
+    def ddx(f):
+        return (f[1:-1, 2:] - f[1:-1, :-2]) / (2*dx)
+
+    def ddy(f):
+        return (f[2:, 1:-1] - f[:-2, 1:-1]) / (2*dy)
+
+    def lap(f):
+        return ((f[1:-1, 2:] - 2*f[1:-1, 1:-1] + f[1:-1, :-2]) / dx**2 +
+                (f[2:, 1:-1] - 2*f[1:-1, 1:-1] + f[:-2, 1:-1]) / dy**2)
+
+    def inner(f):
+        return np.broadcast_to(f, u.shape)[1:-1, 1:-1]
+
+    u_in, v_in = u[1:-1, 1:-1], v[1:-1, 1:-1]
+    fx = -rho*(u_in*ddx(u) + v_in*ddy(u)) + rho*nu*lap(u) - rho*inner(dudt)
+    fy = -rho*(u_in*ddx(v) + v_in*ddy(v)) + rho*nu*lap(v) - rho*inner(dvdt)
+    rx = ddx(p) - fx
+    ry = ddy(p) - fy
+
+    m = slice(margin - 1, -(margin - 1) or None)
+    return float(np.sqrt(np.sum(rx[m, m]**2 + ry[m, m]**2) /
+                         np.sum(fx[m, m]**2 + fy[m, m]**2)))
+
+
+class Reducer:
+    """
+    Base class of diagnostics reducers.
+
+    Subclasses implement compute(u, v, p, case) returning a scalar or array
+    which is appended to the time series, or override update() and reset()
+    for running statistics. The solvers reset every reducer when a run
+    starts, so a reducer list can be passed to several runs.
+
+    Parameters
+    ----------
+    every : int
+        Evaluate every N solver steps
+    name : str, optional
+        Key in results["diagnostics"], defaults to the class attribute
+    """
+
+    name = "reducer"
+
+    def __init__(self, every=1, name=None):
+        self.every = every
+        if name is not None:
+            self.name = name
+        self.reset()
+
+    def reset(self):
+        """
+        Discard all collected data.
+        """
+        self.steps = []
+        self.times = []
+        self.values = []
+
+    def __call__(self, step, t, u, v, p, case):
+        if step % self.every == 0:
+            self.update(step, t, u, v, p, case)
+
+    def update(self, step, t, u, v, p, case):
+        self.steps.append(step)
+        self.times.append(t)
+        self.values.append(self.compute(u, v, p, case))
+
+    def compute(self, u, v, p, case):
+        raise NotImplementedError
+
+    def result(self):
+        """
+        Return dict with 'step', 't' and 'value' arrays.
+        """
+        return {
+            "step": np.array(self.steps, dtype=int),
+            "t": np.array(self.times),
+            "value": np.array(self.values),
+        }
+
+
+class KineticEnergy(Reducer):
+    """
+    Total kinetic energy per unit depth, 0.5 * sum(u^2 + v^2) * dx * dy.
+    """
+
+    name = "kinetic_energy"
+
+    def compute(self, u, v, p, case):
+        return 0.5 * np.sum(u**2 + v**2) * case["dx"] * case["dy"]
+
+
+class Enstrophy(Reducer):
+    """
+    Enstrophy 0.5 * sum(w^2) * dx * dy and maximum |w|.
+    Value columns: [enstrophy, max_abs_vorticity]
+    """
+
+    name = "enstrophy"
+
+    def compute(self, u, v, p, case):
+        w = vorticity(u, v, case["dx"], case["dy"])
+        return [0.5 * np.sum(w**2) * case["dx"] * case["dy"], np.max(np.abs(w))]
+
+
+class PrimaryVortex(Reducer):
+    """
+    Strength and location of the primary vortex, taken as the extremum
+    of the stream function with the largest magnitude.
+    Value columns: [psi, x, y]
+    """
+
+    name = "primary_vortex"
+
+    def compute(self, u, v, p, case):
+        psi = stream_function(u, case["dy"])
+        j, i = np.unravel_index(np.argmax(np.abs(psi)), psi.shape)
+        return [psi[j, i], case["x"][i], case["y"][j]]
+
+
+class WallShearStress(Reducer):
+    """
+    Mean wall shear stress rho * nu * du_t/dn on every wall,
+    using one-sided first-order differences.
+    Value columns: [bottom, top, left, right]
+    """
+
+    name = "wall_shear_stress"
+
+    def compute(self, u, v, p, case):
+        mu = case["rho"] * case["nu"]
+        dx, dy = case["dx"], case["dy"]
+        return [
+            mu * np.mean((u[1, :] - u[0, :]) / dy),
+            mu * np.mean((u[-2, :] - u[-1, :]) / dy),
+            mu * np.mean((v[:, 1] - v[:, 0]) / dx),
+            mu * np.mean((v[:, -2] - v[:, -1]) / dx),
+        ]
+
+
+class CenterlineProfiles(Reducer):
+    """
+    u along the vertical centerline and v along the horizontal centerline.
+    Value has shape (n_samples, ny + nx): u profile followed by v profile.
+    """
+
+    name = "centerline_profiles"
+
+    def compute(self, u, v, p, case):
+        ny, nx = u.shape
+        return np.concatenate([u[:, nx // 2], v[ny // 2, :]])
+
+
+class TimeAverage(Reducer):
+    """
+    Running mean and variance of u, v and p (Welford's algorithm).
+
+    Parameters
+    ----------
+    start : int
+        First step included in the average (skip the initial transient)
+    every : int
+        Accumulate every N steps
+    """
+
+    name = "time_average"
+
+    def __init__(self, start=0, every=1, name=None):
+        super().__init__(every=every, name=name)
+        self.start = start
+
+    def reset(self):
+        super().reset()
+        self.count = 0
+        self.mean = {}
+        self.m2 = {}
+
+    def update(self, step, t, u, v, p, case):
+        if step < self.start:
+            return
+
+        self.count += 1
+        for key, f in (("u", u), ("v", v), ("p", p)):
+            if f is None:
+                continue
+            if key not in self.mean:
+                self.mean[key] = np.zeros_like(f)
+                self.m2[key] = np.zeros_like(f)
+            delta = f - self.mean[key]
+            self.mean[key] += delta / self.count
+            self.m2[key] += delta * (f - self.mean[key])
+
+    def result(self):
+        """
+        Return dict with 'count' and '<field>_mean', '<field>_var' arrays.
+        """
+        out = {"count": self.count}
+        for key in self.mean:
+            out[f"{key}_mean"] = self.mean[key]
+            out[f"{key}_var"] = self.m2[key] / max(self.count - 1, 1)
+        return out
+
+
+def reset_diagnostics(reducers):
+    """
+    Reset a list of reducers before a new run.
+    """
+    for r in reducers:
+        r.reset()
+
+
+def collect_diagnostics(reducers):
+    """
+    Return {name: reducer.result()} for a list of reducers.
+    """
+    results = {}
+    for r in reducers:
+        if r.name in results:
+            raise ValueError(f"Duplicate diagnostics name: {r.name}")
+        results[r.name] = r.result()
+    return results
+
+
+def save_diagnostics(filename, diagnostics):
+    """
+    Save diagnostics dict (results["diagnostics"]) to a compressed .npz file.
+    Arrays are stored under '<name>/<key>'.
+    """
+    arrays = {
+        f"{name}/{key}": np.asarray(value)
+        for name, res in diagnostics.items()
+        for key, value in res.items()
+    }
+    np.savez_compressed(filename, **arrays)
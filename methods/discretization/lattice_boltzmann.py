@@ -0,0 +1,152 @@
+# methods/discretization/lattice_boltzmann.py
+"""
+D2Q9 lattice Boltzmann operators in lattice units (dx = dt = 1).
+Distributions are stored as arrays of shape (9, ny, nx), row index
+along y as in the rest of the solver.
+"""
+
+import numpy as np
+
+# Lattice velocities (cx, cy) and weights
+C = np.array([
+    [0, 0],
+    [1, 0], [0, 1], [-1, 0], [0, -1],
+    [1, 1], [-1, 1], [-1, -1], [1, -1]
+])
+W = np.array([4/9] + [1/9]*4 + [1/36]*4)
+CS2 = 1.0 / 3.0
+
+# MRT transformation matrix (Lallemand & Luo 2000), moments ordered as
+# rho, e, eps, jx, qx, jy, qy, pxx, pxy
+M = np.array([
+    [1, 1, 1, 1, 1, 1, 1, 1, 1],
+    [-4, -1, -1, -1, -1, 2, 2, 2, 2],
+    [4, -2, -2, -2, -2, 1, 1, 1, 1],
+    [0, 1, 0, -1, 0, 1, -1, -1, 1],
+    [0, -2, 0, 2, 0, 1, -1, -1, 1],
+    [0, 0, 1, 0, -1, 1, 1, -1, -1],
+    [0, 0, -2, 0, 2, 1, 1, -1, -1],
+    [0, 1, -1, 1, -1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 1, -1, 1, -1],
+], dtype=float)
+M_INV = np.linalg.inv(M)
+
+
+def equilibrium(rho, u, v):
+    """
+    Second-order equilibrium distribution.
+
+    Parameters
+    ----------
+    rho, u, v : ndarray
+        Density and velocity, any (matching) shape
+
+    Returns
+    -------
+    feq : ndarray
+        Shape (9,) + rho.shape
+    """
+    shape = (9,) + (1,) * np.ndim(rho)
+    cx = C[:, 0].reshape(shape)
+    cy = C[:, 1].reshape(shape)
+    w = W.reshape(shape)
+
+    cu = cx*u + cy*v
+    usq = u**2 + v**2
+    return w * rho * (1 + 3*cu + 4.5*cu**2 - 1.5*usq)
+
+
+def macroscopic(f):
+    """
+    Return density and velocity (rho, u, v) of distributions f.
+    """
+    shape = (9,) + (1,) * (f.ndim - 1)
+    rho = f.sum(axis=0)
+    u = (C[:, 0].reshape(shape) * f).sum(axis=0) / rho
+    v = (C[:, 1].reshape(shape) * f).sum(axis=0) / rho
+    return rho, u, v
+
+
+def stream(f):
+    """
+    Streaming step, f_i(x + c_i) = f_i(x). Periodic wrap-around values
+    at the walls are overwritten by the wall boundary condition.
+    """
+    for i, (cx, cy) in enumerate(C):
+        if cx or cy:
+            f[i] = np.roll(f[i], shift=(cy, cx), axis=(0, 1))
+    return f
+
+
+def collide_bgk(f, tau):
+    """
+    BGK (single relaxation time) collision.
+    """
+    rho, u, v = macroscopic(f)
+    f += (equilibrium(rho, u, v) - f) / tau
+    return f
+
+
+def mrt_relaxation(tau, s_e=1.4, s_eps=1.4, s_q=1.2):
+    """
+    Return the matrix M^-1 S used by collide_mrt().
+    The shear moments relax with 1/tau so that nu = cs^2 (tau - 1/2).
+    """
+    s_nu = 1.0 / tau
+    S = np.diag([0.0, s_e, s_eps, 0.0, s_q, 0.0, s_q, s_nu, s_nu])
+    return M_INV @ S
+
+
+def collide_mrt(f, relax):
+    """
+    MRT (multiple relaxation time) collision.
+
+    Parameters
+    ----------
+    f : ndarray
+        Distributions (9, ny, nx)
+    relax : ndarray
+        Matrix from mrt_relaxation()
+    """
+    rho, u, v = macroscopic(f)
+    m_neq = np.tensordot(M, f - equilibrium(rho, u, v), axes=1)
+    f -= np.tensordot(relax, m_neq, axes=1)
+    return f
+
+
+# Wall node and first interior neighbour for each wall
+_WALL_SLICES = {
+    "bottom": ((slice(None), 0, slice(None)), (slice(None), 1, slice(None))),
+    "top": ((slice(None), -1, slice(None)), (slice(None), -2, slice(None))),
+    "left": ((slice(None), slice(None), 0), (slice(None), slice(None), 1)),
+    "right": ((slice(None), slice(None), -1), (slice(None), slice(None), -2)),
+}
+
+
+def apply_wall_bc(f, walls):
+    """
+    Non-equilibrium extrapolation wall condition (Guo et al. 2002).
+    Wall node distributions are set to the equilibrium at the wall
+    velocity plus the non-equilibrium part of the interior neighbour.
+
+    Parameters
+    ----------
+    f : ndarray
+        Distributions (9, ny, nx), modified in place
+    walls : dict
+        {wall: (u, v)} wall velocities in lattice units, applied in order
+
+    Returns
+    -------
+    f : ndarray
+    """
+    for wall, (u_w, v_w) in walls.items():
+        if wall not in _WALL_SLICES:
+            raise ValueError(f"Unknown wall location: {wall}")
+        wall_idx, nb_idx = _WALL_SLICES[wall]
+
+        f_nb = f[nb_idx]
+        rho_nb, u_nb, v_nb = macroscopic(f_nb)
+        f[wall_idx] = (equilibrium(rho_nb, u_w, v_w) +
+                       f_nb - equilibrium(rho_nb, u_nb, v_nb))
+    return f
@@ -5,7 +5,9 @@ Solves ∇²p = rhs using iterative Jacobi method (or Gauss-Seidel if modified).
 
 import numpy as np
 
-def solve_pressure_Jacobi(p, rhs, dx, dy, tol=1e-6, max_iter=2000):
+def solve_pressure_Jacobi(p, rhs, dx, dy, tol=1e-6, max_iter=2000,
+                          relative=False, return_iterations=False,
+                          wall_gradient=None):
     """
     Solve pressure Poisson equation ∇²p = rhs using iterative Jacobi.
 
@@ -21,16 +23,38 @@ def solve_pressure_Jacobi(p, rhs, dx, dy, tol=1e-6, max_iter=2000):
         Convergence tolerance
     max_iter : int
         Maximum number of iterations
+    relative : bool
+        If False, stop when the norm of the update drops below tol.
+        If True, stop when the RMS residual of ∇²p = rhs relative to the
+        RMS of rhs drops below tol, which means the same at any grid size.
+        Mean values are removed first: with Neumann conditions on all
+        walls the mean of the residual is the incompatible part of rhs,
+        which no iteration can reduce.
+    return_iterations : bool
+        Also return the number of iterations done
+    wall_gradient : dict, optional
+        Prescribed wall pressure gradients, 1D arrays along each wall:
+        dp/dy for 'bottom' and 'top', dp/dx for 'left' and 'right'.
+        Imposed with second-order one-sided differences. By default
+        dp/dn = 0 on all walls.
 
     Returns
     -------
     p : 2D ndarray
         Pressure field satisfying Poisson eqn
+    n_iter : int
+        Number of iterations, only if return_iterations is True
     """
 
     ny, nx = p.shape
     p_new = p.copy()
 
+    # Jacobi update is (residual of old iterate) * dx²dy² / (2(dx²+dy²))
+    res_scale = 2*(dx**2 + dy**2) / (dx**2 * dy**2)
+    rhs_in = rhs[1:-1, 1:-1]
+    rhs_rms = np.sqrt(np.mean((rhs_in - rhs_in.mean())**2))
+
+    it = -1
     for it in range(max_iter):
         p_old = p_new.copy()
 
@@ -42,16 +66,31 @@ def solve_pressure_Jacobi(p, rhs, dx, dy, tol=1e-6, max_iter=2000):
             / (2*(dx**2 + dy**2))
         )
 
-        # Boundary conditions: dp/dn = 0 (Neumann)
-        p_new[:, 0] = p_new[:, 1]      # left
-        p_new[:, -1] = p_new[:, -2]    # right
-        p_new[0, :] = p_new[1, :]      # bottom
-        p_new[-1, :] = p_new[-2, :]    # top
+        if wall_gradient is None:
+            # Boundary conditions: dp/dn = 0 (Neumann)
+            p_new[:, 0] = p_new[:, 1]      # left
+            p_new[:, -1] = p_new[:, -2]    # right
+            p_new[0, :] = p_new[1, :]      # bottom
+            p_new[-1, :] = p_new[-2, :]    # top
+        else:
+            # Boundary conditions: prescribed dp/dn (Neumann)
+            g = wall_gradient
+            p_new[:, 0] = (4*p_new[:, 1] - p_new[:, 2] - 2*dx*g["left"]) / 3
+            p_new[:, -1] = (4*p_new[:, -2] - p_new[:, -3] + 2*dx*g["right"]) / 3
+            p_new[0, :] = (4*p_new[1, :] - p_new[2, :] - 2*dy*g["bottom"]) / 3
+            p_new[-1, :] = (4*p_new[-2, :] - p_new[-3, :] + 2*dy*g["top"]) / 3
 
         # Check convergence
-        if np.linalg.norm(p_new - p_old, ord=2) < tol:
+        if relative:
+            delta = p_new[1:-1, 1:-1] - p_old[1:-1, 1:-1]
+            res_rms = res_scale * np.sqrt(np.mean((delta - delta.mean())**2))
+            if res_rms <= tol * rhs_rms:
+                break
+        elif np.linalg.norm(p_new - p_old, ord=2) < tol:
             break
 
+    if return_iterations:
+        return p_new, it + 1
     return p_new
 
 import numpy as np
@@ -0,0 +1,119 @@
+# methods/discretization/streamfunction.py
+"""
+Operators for the streamfunction-vorticity formulation.
+Solves ∇²psi = -omega with psi = 0 on the walls and provides
+Thom's wall vorticity boundary condition.
+"""
+
+import numpy as np
+from methods.initialization.initialize_fields import wall_velocity
+
+
+def laplacian(f, dx, dy):
+    """
+    Five-point Laplacian of f for interior points (zero on the boundary).
+    """
+    lap = np.zeros_like(f)
+    lap[1:-1, 1:-1] = (
+        (f[1:-1, 2:] - 2*f[1:-1, 1:-1] + f[1:-1, :-2]) / dx**2 +
+        (f[2:, 1:-1] - 2*f[1:-1, 1:-1] + f[:-2, 1:-1]) / dy**2
+    )
+    return lap
+
+
+def solve_streamfunction_Jacobi(psi, omega, dx, dy, tol=1e-6, max_iter=2000):
+    """
+    Solve ∇²psi = -omega using iterative Jacobi, psi = 0 on all walls.
+
+    Parameters
+    ----------
+    psi : 2D ndarray
+        Initial guess (previous time step)
+    omega : 2D ndarray
+        Vorticity field
+    dx, dy : float
+        Grid spacing
+    tol : float
+        Convergence tolerance
+    max_iter : int
+        Maximum number of iterations
+
+    Returns
+    -------
+    psi : 2D ndarray
+        Stream function
+    """
+    psi_new = psi.copy()
+    psi_new[0, :] = psi_new[-1, :] = 0.0
+    psi_new[:, 0] = psi_new[:, -1] = 0.0
+
+    for it in range(max_iter):
+        psi_old = psi_new.copy()
+
+        psi_new[1:-1, 1:-1] = (
+            (dy**2*(psi_old[1:-1, 2:] + psi_old[1:-1, :-2]) +
+             dx**2*(psi_old[2:, 1:-1] + psi_old[:-2, 1:-1]) +
+             dx**2 * dy**2 * omega[1:-1, 1:-1])
+            / (2*(dx**2 + dy**2))
+        )
+
+        if np.linalg.norm(psi_new - psi_old) < tol:
+            break
+
+    return psi_new
+
+
+def wall_tangential_velocities(bc):
+    """
+    Extract tangential wall velocities from the boundary condition dict.
+
+    Walls must be impermeable (zero normal velocity), since psi is
+    constant along them.
+
+    Returns
+    -------
+    dict
+        {"top": u, "bottom": u, "left": v, "right": v}
+    """
+    tangential = {"top": 0.0, "bottom": 0.0, "left": 0.0, "right": 0.0}
+
+    for wall, spec in bc.items():
+        u_val, v_val = wall_velocity(wall, spec)
+
+        if wall in ("top", "bottom"):
+            tangential_val, normal_val = u_val, v_val
+        elif wall in ("left", "right"):
+            tangential_val, normal_val = v_val, u_val
+        else:
+            raise ValueError(f"Unknown wall location: {wall}")
+
+        if normal_val != 0.0:
+            raise ValueError(f"Wall '{wall}' has non-zero normal velocity, "
+                             "which the streamfunction formulation does not support")
+        tangential[wall] = tangential_val
+
+    return tangential
+
+
+def apply_vorticity_bc(omega, psi, walls, dx, dy):
+    """
+    Set wall vorticity with Thom's first-order formula.
+
+    Parameters
+    ----------
+    omega, psi : 2D ndarray
+        Vorticity (modified in place) and stream function
+    walls : dict
+        Tangential wall velocities from wall_tangential_velocities()
+    dx, dy : float
+        Grid spacing
+
+    Returns
+    -------
+    omega : 2D ndarray
+    """
+    omega[0, :] = -2*psi[1, :] / dy**2 + 2*walls["bottom"] / dy
+    omega[-1, :] = -2*psi[-2, :] / dy**2 - 2*walls["top"] / dy
+    omega[:, 0] = -2*psi[:, 1] / dx**2 - 2*walls["left"] / dx
+    omega[:, -1] = -2*psi[:, -2] / dx**2 + 2*walls["right"] / dx
+    return omega
@@ -27,6 +27,35 @@ def create_fields(nx, ny):
     return u, v, p
 
 
+def wall_velocity(wall, spec):
+    """
+    Return the velocity [u, v] prescribed on a wall.
+
+    Parameters
+    ----------
+    wall : str
+        Wall name, used in error messages
+    spec : dict
+        Boundary condition entry of that wall
+
+    Returns
+    -------
+    tuple
+        u_val, v_val
+    """
+    wall_type = spec.get("type", "stationary_wall")
+
+    if wall_type == "stationary_wall":
+        return 0.0, 0.0
+    elif wall_type == "moving_wall":
+        vel = spec.get("velocity")
+        if not vel or len(vel) != 2:
+            raise ValueError(f"Wall '{wall}' must have 'velocity'=[u,v]")
+        return vel[0], vel[1]
+    else:
+        raise ValueError(f"Unknown wall type: {wall_type}")
+
+
 def apply_velocity_bc(u, v, bc):
     """
     Apply velocity boundary conditions to u and v arrays.
@@ -52,17 +81,7 @@ def apply_velocity_bc(u, v, bc):
     ny, nx = u.shape
 
     for wall, spec in bc.items():
-        wall_type = spec.get("type", "stationary_wall")
-
-        if wall_type == "stationary_wall":
-            u_val, v_val = 0.0, 0.0
-        elif wall_type == "moving_wall":
-            vel = spec.get("velocity")
-            if not vel or len(vel) != 2:
-                raise ValueError(f"Wall '{wall}' must have 'velocity'=[u,v]")
-            u_val, v_val = vel
-        else:
-            raise ValueError(f"Unknown wall type: {wall_type}")
+        u_val, v_val = wall_velocity(wall, spec)
 
         if wall == "top":
             u[-1, :] = u_val
@@ -0,0 +1,348 @@
+# methods/result_store.py
+"""
+Content-addressed cache of whole solver runs.
+
+Runs are keyed by a hash of the normalized case configuration (domain,
+fluid, BC, dt, solver and its options) and of the solver source code.
+t_final is not part of the key: entries of the same case are stored per
+number of completed steps, so a request with a longer t_final continues
+from the longest cached run instead of starting over.
+
+Usage:
+    store = ResultStore("cache", max_bytes=2 * 1024**3)
+    results = cached_solve(store, domain, fluid, BC, dt, t_final,
+                           solver=solve_cavity, scheme_first="backward")
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import inspect
+import tempfile
+import contextlib
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, store is then single-process only
+    fcntl = None
+
+import numpy as np
+from methods.solver import solve_cavity
+
+# Final-state arrays some engines return besides u, v, p (needed to continue)
+_STATE_KEYS = ("psi", "omega", "f", "pressure_rtol")
+
+_CODE_VERSION = None
+
+
+def code_version():
+    """
+    Hash of all Python sources of the methods package. Any change of
+    the solver code invalidates cached results.
+    """
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.endswith(".py"):
+                    path = os.path.join(dirpath, name)
+                    h.update(os.path.relpath(path, root).encode())
+                    with open(path, "rb") as fh:
+                        h.update(fh.read())
+        _CODE_VERSION = h.hexdigest()
+    return _CODE_VERSION
+
+
+def normalize(obj):
+    """
+    Convert a configuration object into a canonical JSON-compatible form.
+    Dicts are key-sorted (by json.dumps) and all numbers become floats,
+    so 1 and 1.0 hash the same.
+    """
+    if isinstance(obj, dict):
+        return {str(k): normalize(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        return [normalize(v) for v in obj]
+    if obj is None or isinstance(obj, str):
+        return obj
+    if isinstance(obj, (bool, np.bool_)):
+        return bool(obj)
+    if isinstance(obj, (int, float, np.integer, np.floating)):
+        return float(obj)
+    raise TypeError(f"Cannot normalize configuration value of type {type(obj).__name__}")
+
+
+# Arguments that are not part of a case's identity
+_UNKEYED = ("t_final", "initial_state", "diagnostics")
+
+
+def solver_options(solver, options):
+    """
+    Bind options to the solver signature and fill in defaults, so that
+    passing a default value explicitly or omitting it gives the same key.
+    """
+    bound = inspect.signature(solver).bind_partial(**options)
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items()
+            if name not in _UNKEYED and name not in ("domain", "fluid", "bc", "dt")}
+
+
+def case_key(solver, domain, fluid, bc, dt, options):
+    """
+    Return the hex key of a case (everything except t_final).
+    """
+    config = {
+        "solver": f"{solver.__module__}.{solver.__qualname__}",
+        "domain": domain,
+        "fluid": fluid,
+        "bc": bc,
+        "dt": dt,
+        "options": solver_options(solver, options),
+    }
+    blob = json.dumps(normalize(config), sort_keys=True)
+    h = hashlib.sha256()
+    h.update(blob.encode())
+    h.update(code_version().encode())
+    return h.hexdigest()
+
+
+class ResultStore:
+    """
+    On-disk store of solver results with size-based LRU eviction.
+
+    Layout: <root>/<case key>/<n_steps>/{fields.npz, history.npz, meta.json}
+
+    Parameters
+    ----------
+    root : str
+        Store directory (created if missing)
+    max_bytes : int or None
+        Total size limit. Least recently used entries are evicted
+        after every put(). None disables eviction.
+
+    Several processes may share one store: put() and evict() hold an
+    exclusive lock on <root>/.lock, and readers treat entries that
+    disappear underneath them as cache misses.
+    """
+
+    def __init__(self, root, max_bytes=2 * 1024**3):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._tmp_root = os.path.join(root, ".tmp")
+        os.makedirs(self._tmp_root, exist_ok=True)
+
+    @contextlib.contextmanager
+    def _lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.root, ".lock"), "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _entry_dir(self, key, n_steps):
+        return os.path.join(self.root, key, f"{n_steps:012d}")
+
+    def steps(self, key):
+        """
+        Sorted list of cached step counts for a case key.
+        """
+        try:
+            names = os.listdir(os.path.join(self.root, key))
+        except FileNotFoundError:
+            return []
+        return sorted(int(name) for name in names if name.isdigit())
+
+    def get(self, key, n_steps):
+        """
+        Return cached results for exactly n_steps, or None.
+        """
+        path = self._entry_dir(key, n_steps)
+        try:
+            with np.load(os.path.join(path, "fields.npz")) as data:
+                results = {name: data[name] for name in data.files}
+            with np.load(os.path.join(path, "history.npz")) as data:
+                hist = {name: data[name] for name in data.files}
+            # Mark as recently used
+            os.utime(os.path.join(path, "meta.json"))
+        except FileNotFoundError:
+            # Missing or evicted by another process meanwhile
+            return None
+
+        results["step"] = n_steps
+        if "pressure_rtol" in results:
+            results["pressure_rtol"] = float(results["pressure_rtol"])
+        if "pressure_iterations" in hist:
+            results["pressure_iterations"] = hist["pressure_iterations"]
+        for name in ("u_hist", "v_hist", "p_hist"):
+            results[name] = list(hist[name])
+        results["snapshots"] = [
+            {"u": u, "v": v, "p": p, "step": int(step)}
+            for u, v, p, step in zip(results["u_hist"], results["v_hist"],
+                                     results["p_hist"], hist["steps"])
+        ]
+        results["diagnostics"] = {}
+        return results
+
+    def latest(self, key, n_steps):
+        """
+        Return the largest cached step count <= n_steps, or None.
+        """
+        candidates = [n for n in self.steps(key) if n <= n_steps]
+        return candidates[-1] if candidates else None
+
+    def put(self, key, n_steps, results, config=None):
+        """
+        Store results of a run that completed n_steps steps.
+        """
+        fields = {name: results[name] for name in ("u", "v", "p", "x", "y")}
+        for name in _STATE_KEYS:
+            if name in results:
+                fields[name] = results[name]
+
+        ny, nx = results["u"].shape
+        steps = [s["step"] for s in results.get("snapshots", [])]
+        hist = {
+            name: np.asarray(results[name]).reshape(-1, ny, nx)
+            for name in ("u_hist", "v_hist", "p_hist")
+        }
+        hist["steps"] = np.array(steps, dtype=int)
+        if "pressure_iterations" in results:
+            hist["pressure_iterations"] = np.asarray(results["pressure_iterations"], dtype=int)
+
+        # Write to a temporary directory first so readers never see partial entries
+        os.makedirs(self._tmp_root, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self._tmp_root)
+        np.savez(os.path.join(tmp, "fields.npz"), **fields)
+        np.savez_compressed(os.path.join(tmp, "history.npz"), **hist)
+        with open(os.path.join(tmp, "meta.json"), "w") as fh:
+            json.dump({"n_steps": n_steps, "created": time.time(),
+                       "config": config}, fh)
+
+        path = self._entry_dir(key, n_steps)
+        with self._lock():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.isdir(path):
+                # Same run already stored by another process
+                shutil.rmtree(path)
+            os.replace(tmp, path)
+            self._evict()
+
+    def entries(self):
+        """
+        List of (last_used, size_bytes, path) of all entries.
+        """
+        out = []
+        for key in os.listdir(self.root):
+            case_dir = os.path.join(self.root, key)
+            if key.startswith(".") or not os.path.isdir(case_dir):
+                continue
+            try:
+                names = os.listdir(case_dir)
+            except FileNotFoundError:
+                continue
+            for name in names:
+                path = os.path.join(case_dir, name)
+                if not name.isdigit():
+                    continue
+                try:
+                    size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+                    out.append((os.path.getmtime(os.path.join(path, "meta.json")), size, path))
+                except FileNotFoundError:
+                    # Removed by another process while listing
+                    continue
+        return out
+
+    def evict(self):
+        """
+        Remove least recently used entries until the store fits max_bytes.
+        """
+        if self.max_bytes is None:
+            return
+        with self._lock():
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock
+        if self.max_bytes is None:
+            return
+
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            case_dir = os.path.dirname(path)
+            try:
+                os.rmdir(case_dir)
+            except OSError:
+                # Not empty
+                pass
+
+
+def cached_solve(store, domain, fluid, bc, dt, t_final, solver=solve_cavity, **kwargs):
+    """
+    Run solver(domain, fluid, bc, dt, t_final, **kwargs) through a ResultStore.
+
+    Identical cases are returned from the store. If only a shorter run of
+    the same case is cached and the solver accepts initial_state, the run
+    continues from its end state and the histories are joined.
+    Runs with diagnostics are stateful and always bypass the store.
+
+    Parameters
+    ----------
+    store : ResultStore
+        Result store
+    domain, fluid, bc, dt, t_final :
+        As for solve_cavity
+    solver : callable
+        solve_cavity, solve_cavity_psi_omega or solve_cavity_lbm
+    kwargs :
+        Further solver options, part of the cache key
+
+    Returns
+    -------
+    results : dict
+        Same as the solver's result dict
+    """
+    if kwargs.get("diagnostics") or "initial_state" in kwargs:
+        return solver(domain, fluid, bc, dt, t_final, **kwargs)
+
+    key = case_key(solver, domain, fluid, bc, dt, kwargs)
+    n_steps = int(t_final / dt)
+
+    cached = store.latest(key, n_steps)
+    if cached == n_steps:
+        results = store.get(key, n_steps)
+        if results is not None:
+            return results
+        cached = None
+
+    previous = None
+    if cached is not None and "initial_state" in inspect.signature(solver).parameters:
+        previous = store.get(key, cached)
+
+    if previous is not None:
+        results = solver(domain, fluid, bc, dt, t_final, initial_state=previous, **kwargs)
+        for name in ("u_hist", "v_hist", "p_hist", "snapshots"):
+            results[name] = previous[name] + results[name]
+        if "pressure_iterations" in results and "pressure_iterations" in previous:
+            results["pressure_iterations"] = np.concatenate(
+                [previous["pressure_iterations"], results["pressure_iterations"]])
+    else:
+        results = solver(domain, fluid, bc, dt, t_final, **kwargs)
+
+    config = normalize({"domain": domain, "fluid": fluid, "bc": bc, "dt": dt,
+                        "t_final": t_final, "options": kwargs})
+    store.put(key, n_steps, results, config=config)
+    return results
@@ -9,10 +9,37 @@ from methods.initialization.initialize_domain import create_domain
 from methods.initialization.initialize_fields import create_fields, apply_velocity_bc
 from methods.discretization.momentum import compute_tentative_velocity
 from methods.discretization.poisson_pressure import solve_pressure_Gauss_Seidel, solve_pressure_Jacobi
+from methods.diagnostics import collect_diagnostics, reset_diagnostics
+
+
+def _next_pressure_rtol(u, v, u_old, v_old, dx, dy, h,
+                        rtol, rtol_min, rtol_max, eta):
+    """
+    Relative pressure tolerance for the next step of the inexact projection.
+
+    Momentum residual: RMS velocity change of the step relative to the RMS
+    velocity. Divergence level: RMS divergence of the corrected velocity,
+    made dimensionless with the grid spacing and the maximum velocity.
+    """
+    u_rms = np.sqrt(np.mean(u**2 + v**2)) + 1e-30
+    r_mom = np.sqrt(np.mean((u - u_old)**2 + (v - v_old)**2)) / u_rms
+
+    div = ((u[1:-1, 2:] - u[1:-1, :-2]) / (2*dx) +
+           (v[2:, 1:-1] - v[:-2, 1:-1]) / (2*dy))
+    u_max = max(np.abs(u).max(), np.abs(v).max()) + 1e-30
+    r_div = np.sqrt(np.mean(div**2)) * h / u_max
+
+    rtol_next = eta * r_mom
+    if r_div > r_mom:
+        rtol_next = min(rtol_next, 0.5 * rtol)
+    return float(np.clip(rtol_next, rtol_min, rtol_max))
+
 
 def solve_cavity(domain, fluid, bc, dt, t_final,
                  scheme_first="backward", scheme_second="central",
-                 tol=1e-6, max_iter=2000, save_interval=None):
+                 tol=1e-6, max_iter=2000, save_interval=None, diagnostics=None,
+                 initial_state=None, pressure_tol="fixed",
+                 rtol_range=(1e-6, 1e-2), eta=0.1):
     """
     Solve 2D lid-driven cavity flow.
 
@@ -33,18 +60,45 @@ def solve_cavity(domain, fluid, bc, dt, t_final,
     scheme_second : str
         Finite difference scheme for 2nd derivatives ('central' or 'backward')
     tol : float
-        Tolerance for pressure Poisson solver
+        Tolerance for pressure Poisson solver (pressure_tol='fixed')
     max_iter : int
         Maximum iterations for pressure Poisson solver
     save_interval : int or None
         If provided, save snapshots every N steps
+    diagnostics : list of Reducer or None
+        On-the-fly diagnostics (see methods/diagnostics.py), called
+        after every step with the updated fields
+    initial_state : dict or None
+        Continue a previous run: dict with 'step' (number of completed
+        steps) and the final fields of that run ('u', 'v', 'p').
+        With pressure_tol='adaptive' it may also hold 'pressure_rtol',
+        the tolerance the previous run had reached. Steps are counted from the start of the original run, so
+        t_final is the total simulation time.
+    pressure_tol : str
+        'fixed' uses the absolute tolerance tol for every pressure solve.
+        'adaptive' (inexact projection) uses a relative, grid-normalized
+        residual tolerance eta * (relative velocity change of the last
+        step), clipped to rtol_range. It is loose in the early transient
+        and tightens towards rtol_range[0] as the flow becomes steady.
+        If the divergence left by the projection exceeds the velocity
+        change, the tolerance is halved.
+    rtol_range : tuple
+        (min, max) relative pressure tolerance for pressure_tol='adaptive'
+    eta : float
+        Forcing factor for pressure_tol='adaptive'
 
     Returns
     -------
     results : dict
-        u, v, p, x, y
+        u, v, p, x, y, step, histories and diagnostics, and
+        'pressure_iterations' (iterations of each pressure solve of
+        this call), and 'pressure_rtol' (tolerance for the next step)
+        if pressure_tol='adaptive'
     """
 
+    if pressure_tol not in ("fixed", "adaptive"):
+        raise ValueError("pressure_tol must be 'fixed' or 'adaptive'")
+
     # Initialize domain and mesh
     domain_data = create_domain(domain)
     nx, ny = domain_data["nx"], domain_data["ny"]
@@ -57,6 +111,13 @@ def solve_cavity(domain, fluid, bc, dt, t_final,
     #Initialize velocity and pressure fields
     u, v, p = create_fields(nx, ny)
 
+    start = 0
+    if initial_state is not None:
+        start = initial_state["step"]
+        u = initial_state["u"].copy()
+        v = initial_state["v"].copy()
+        p = initial_state["p"].copy()
+
     #Apply initial velocity BCs
     u, v = apply_velocity_bc(u, v, bc)
 
@@ -65,10 +126,22 @@ def solve_cavity(domain, fluid, bc, dt, t_final,
     rho = fluid["rho"]
     nu = fluid["nu"]
 
+    diagnostics = diagnostics or []
+    reset_diagnostics(diagnostics)
+    case = dict(domain_data, rho=rho, nu=nu, dt=dt)
+
     # Optional storage
     snapshots = []
 
-    for step in range(n_steps):
+    adaptive = pressure_tol == "adaptive"
+    rtol_min, rtol_max = rtol_range
+    rtol = rtol_max
+    if adaptive and initial_state is not None and "pressure_rtol" in initial_state:
+        rtol = float(initial_state["pressure_rtol"])
+    h = min(dx, dy)
+    pressure_iterations = []
+
+    for step in range(start, n_steps):
         #Compute tentative velocity (u*, v*)
         u_star, v_star = compute_tentative_velocity(
             u, v, nu, dx, dy, dt,
@@ -84,7 +157,14 @@ def solve_cavity(domain, fluid, bc, dt, t_final,
         )
 
         #Solve pressure Poisson
-        p = solve_pressure_Jacobi(p, rhs, dx, dy, tol=tol, max_iter=max_iter)
+        if adaptive:
+            u_old, v_old = u.copy(), v.copy()
+            p, n_iter = solve_pressure_Jacobi(p, rhs, dx, dy, tol=rtol, max_iter=max_iter,
+                                              relative=True, return_iterations=True)
+        else:
+            p, n_iter = solve_pressure_Jacobi(p, rhs, dx, dy, tol=tol, max_iter=max_iter,
+                                              return_iterations=True)
+        pressure_iterations.append(n_iter)
 
         #Update velocity using pressure gradient
         u[1:-1, 1:-1] = u_star[1:-1, 1:-1] - (dt/rho) * (p[1:-1, 2:] - p[1:-1, :-2]) / (2*dx)
@@ -93,7 +173,15 @@ def solve_cavity(domain, fluid, bc, dt, t_final,
         #Apply velocity boundary conditions
         u, v = apply_velocity_bc(u, v, bc)
 
-        if step % save_interval == 0:
+        #Tolerance for the next pressure solve
+        if adaptive:
+            rtol = _next_pressure_rtol(u, v, u_old, v_old, dx, dy, h,
+                                       rtol, rtol_min, rtol_max, eta)
+
+        for reducer in diagnostics:
+            reducer(step, (step + 1) * dt, u, v, p, case)
+
+        if save_interval and step % save_interval == 0:
             u_hist.append(u.copy())
             v_hist.append(v.copy())
             p_hist.append(p.copy())
@@ -114,9 +202,14 @@ def solve_cavity(domain, fluid, bc, dt, t_final,
         "p": p,
         "x": x,
         "y": y,
+        "step": max(n_steps, start),
         "u_hist" : u_hist,
         "v_hist" : v_hist,
         "p_hist" : p_hist,
-        "snapshots": snapshots
+        "snapshots": snapshots,
+        "pressure_iterations": np.array(pressure_iterations, dtype=int),
+        "diagnostics": collect_diagnostics(diagnostics)
     }
+    if adaptive:
+        results["pressure_rtol"] = rtol
     return results
\ No newline at end of file
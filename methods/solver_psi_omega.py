@@ -0,0 +1,231 @@
+# methods/solver_psi_omega.py
+"""
+2D Lid-Driven Cavity Solver, streamfunction-vorticity formulation.
+Needs one Poisson solve per step (for the stream function); pressure is
+only recovered on request. Returns the same result dict as solve_cavity.
+"""
+
+import numpy as np
+from methods.initialization.initialize_domain import create_domain
+from methods.initialization.initialize_fields import create_fields, apply_velocity_bc
+from methods.discretization.finite_differences import (
+    central_difference_x, central_difference_y,
+    backward_difference_x, backward_difference_y
+)
+from methods.discretization.streamfunction import (
+    laplacian, solve_streamfunction_Jacobi,
+    wall_tangential_velocities, apply_vorticity_bc
+)
+from methods.discretization.poisson_pressure import solve_pressure_Jacobi
+from methods.diagnostics import collect_diagnostics, reset_diagnostics
+
+
+def wall_pressure_gradient(u, v, rho, nu, dx, dy):
+    """
+    Wall-normal pressure gradients from the momentum equation.
+
+    On a wall moving with constant tangential speed the time derivative
+    and the advection term vanish, so grad p = rho nu ∇²u there. Along
+    the wall the velocity is constant, which leaves dp/dy = rho nu d²v/dy²
+    on the bottom and top walls and dp/dx = rho nu d²u/dx² on the left
+    and right walls (second-order one-sided differences).
+
+    Returns
+    -------
+    dict
+        1D arrays along each wall, keyed 'bottom', 'top', 'left', 'right'
+    """
+    mu = rho * nu
+    return {
+        "bottom": mu * (2*v[0, :] - 5*v[1, :] + 4*v[2, :] - v[3, :]) / dy**2,
+        "top": mu * (2*v[-1, :] - 5*v[-2, :] + 4*v[-3, :] - v[-4, :]) / dy**2,
+        "left": mu * (2*u[:, 0] - 5*u[:, 1] + 4*u[:, 2] - u[:, 3]) / dx**2,
+        "right": mu * (2*u[:, -1] - 5*u[:, -2] + 4*u[:, -3] - u[:, -4]) / dx**2,
+    }
+
+
+def recover_pressure(u, v, rho, nu, dx, dy, p=None, tol=1e-3, max_iter=20000):
+    """
+    Recover pressure from a velocity field by solving
+    ∇²p = 2 rho (du/dx dv/dy - du/dy dv/dx), with the wall-normal
+    gradients of wall_pressure_gradient() as Neumann conditions.
+
+    Parameters
+    ----------
+    u, v : 2D ndarray
+        Velocity fields
+    rho, nu : float
+        Density and kinematic viscosity
+    dx, dy : float
+        Grid spacing
+    p : 2D ndarray, optional
+        Initial guess, zeros by default
+    tol : float
+        Relative residual of the Poisson solve (see solve_pressure_Jacobi)
+    max_iter : int
+        Maximum number of Jacobi iterations
+
+    Returns
+    -------
+    p : 2D ndarray
+        Pressure field with zero mean
+    """
+    if p is None:
+        p = np.zeros_like(u)
+
+    rhs = 2 * rho * (
+        central_difference_x(u, dx) * central_difference_y(v, dy) -
+        central_difference_y(u, dy) * central_difference_x(v, dx)
+    )
+    p = solve_pressure_Jacobi(p, rhs, dx, dy, tol=tol, max_iter=max_iter, relative=True,
+                              wall_gradient=wall_pressure_gradient(u, v, rho, nu, dx, dy))
+    # Discretely the Neumann data are not exactly compatible with rhs,
+    # which only shifts the mean, so fix it
+    return p - p.mean()
+
+
+def solve_cavity_psi_omega(domain, fluid, bc, dt, t_final,
+                           scheme_first="backward",
+                           tol=1e-6, max_iter=2000, save_interval=None,
+                           diagnostics=None, compute_pressure=True,
+                           initial_state=None):
+    """
+    Solve 2D lid-driven cavity flow in streamfunction-vorticity form.
+
+    Parameters
+    ----------
+    domain : dict
+        Must contain 'nx', 'ny', 'lx', 'ly'
+    fluid : dict
+        Must contain 'rho' and 'nu'
+    bc : dict
+        Boundary condition dictionary for velocity. Walls must have
+        zero normal velocity.
+    dt : float
+        Time step
+    t_final : float
+        Final simulation time
+    scheme_first : str
+        Finite difference scheme for vorticity advection ('central' or 'backward')
+    tol : float
+        Tolerance for the stream function Poisson solver
+    max_iter : int
+        Maximum iterations for the stream function Poisson solver
+    save_interval : int or None
+        If provided, save snapshots every N steps
+    diagnostics : list of Reducer or None
+        On-the-fly diagnostics (see methods/diagnostics.py). Pressure is
+        not computed during the run, so reducers always get p = None
+        (TimeAverage then averages only u and v).
+    compute_pressure : bool
+        Recover pressure for the final fields and saved snapshots.
+        If False, p is returned as zeros.
+    initial_state : dict or None
+        Continue a previous run: dict with 'step' (number of completed
+        steps) and the final fields of that run ('u', 'v', 'p', 'psi', 'omega').
+        Steps are counted from the start of the original run, so
+        t_final is the total simulation time.
+
+    Returns
+    -------
+    results : dict
+        u, v, p, x, y, step, histories and diagnostics, plus 'psi' and 'omega'
+    """
+
+    if scheme_first == "central":
+        ddx, ddy = central_difference_x, central_difference_y
+    elif scheme_first == "backward":
+        ddx, ddy = backward_difference_x, backward_difference_y
+    else:
+        raise ValueError("scheme_first must be 'central' or 'backward'")
+
+    # Initialize domain and mesh
+    domain_data = create_domain(domain)
+    nx, ny = domain_data["nx"], domain_data["ny"]
+    dx, dy = domain_data["dx"], domain_data["dy"]
+    x, y = domain_data["x"], domain_data["y"]
+    u_hist = []
+    v_hist = []
+    p_hist = []
+    snapshots = []
+
+    walls = wall_tangential_velocities(bc)
+
+    # Initialize fields
+    u, v, p = create_fields(nx, ny)
+    u, v = apply_velocity_bc(u, v, bc)
+    psi = np.zeros((ny, nx))
+    omega = np.zeros((ny, nx))
+    omega = apply_vorticity_bc(omega, psi, walls, dx, dy)
+
+    start = 0
+    if initial_state is not None:
+        start = initial_state["step"]
+        u = initial_state["u"].copy()
+        v = initial_state["v"].copy()
+        p = initial_state["p"].copy()
+        psi = initial_state["psi"].copy()
+        omega = initial_state["omega"].copy()
+
+    n_steps = int(t_final / dt)
+    rho = fluid["rho"]
+    nu = fluid["nu"]
+
+    diagnostics = diagnostics or []
+    reset_diagnostics(diagnostics)
+    case = dict(domain_data, rho=rho, nu=nu, dt=dt)
+
+    def pressure(u, v, p):
+        if not compute_pressure:
+            return np.zeros_like(u)
+        return recover_pressure(u, v, rho, nu, dx, dy, p=p)
+
+    for step in range(start, n_steps):
+        # Vorticity transport, interior points
+        rhs = -u*ddx(omega, dx) - v*ddy(omega, dy) + nu*laplacian(omega, dx, dy)
+        omega[1:-1, 1:-1] += dt * rhs[1:-1, 1:-1]
+
+        # Stream function
+        psi = solve_streamfunction_Jacobi(psi, omega, dx, dy, tol=tol, max_iter=max_iter)
+
+        # Velocity from stream function: u = dpsi/dy, v = -dpsi/dx
+        u[1:-1, 1:-1] = (psi[2:, 1:-1] - psi[:-2, 1:-1]) / (2*dy)
+        v[1:-1, 1:-1] = -(psi[1:-1, 2:] - psi[1:-1, :-2]) / (2*dx)
+        u, v = apply_velocity_bc(u, v, bc)
+
+        # Wall vorticity
+        omega = apply_vorticity_bc(omega, psi, walls, dx, dy)
+
+        for reducer in diagnostics:
+            reducer(step, (step + 1) * dt, u, v, None, case)
+
+        if save_interval and step % save_interval == 0:
+            p = pressure(u, v, p)
+            u_hist.append(u.copy())
+            v_hist.append(v.copy())
+            p_hist.append(p.copy())
+            snapshots.append({
+                "u": u.copy(),
+                "v": v.copy(),
+                "p": p.copy(),
+                "step": step
+            })
+
+    p = pressure(u, v, p)
+
+    results = {
+        "u": u,
+        "v": v,
+        "p": p,
+        "x": x,
+        "y": y,
+        "step": max(n_steps, start),
+        "psi": psi,
+        "omega": omega,
+        "u_hist": u_hist,
+        "v_hist": v_hist,
+        "p_hist": p_hist,
+        "snapshots": snapshots,
+        "diagnostics": collect_diagnostics(diagnostics)
+    }
+    return results
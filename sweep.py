@@ -0,0 +1,249 @@
+# sweep.py
+"""
+Batch entry point: run a parameter sweep of cavity cases on a process pool.
+
+The sweep spec is a JSON file:
+
+{
+    "solver": "projection",              # "projection", "psi_omega" or "lbm"
+    "base": {"domain": {...}, "fluid": {...}, "bc": {...}},
+    "grid": {
+        "domain.nx": [41, 81],
+        "domain.ny": [41, 81],
+        "fluid.nu": [0.1, 0.01],
+        "bc.bottom.velocity": [[1.0, 0.0], [2.0, 0.0]]
+    },
+    "zip": ["domain.nx", "domain.ny"],   # optional, vary these together
+    "options": {"scheme_first": "backward"}
+}
+
+Missing "base" entries default to the dicts in the config directory.
+Every combination of the "grid" values is one case; keys listed in
+"zip" are varied together instead of crossed. The time step follows
+from the Courant number and the largest wall speed, as in run.py.
+
+Cases are run longest-first, with BLAS limited to one thread per worker,
+and each result is written to <out>/<case>.npz as soon as it finishes,
+together with a line in <out>/index.jsonl. Nothing is plotted.
+
+Usage:
+    python sweep.py spec.json --out sweep_results --workers 8
+"""
+
+import os
+
+# Pin BLAS/OpenMP threads before numpy is imported (also inherited by workers)
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+             "BLIS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import copy
+import json
+import time
+import argparse
+import itertools
+import multiprocessing as mp
+
+import numpy as np
+
+from config.domain import domain as default_domain
+from config.boundary_conditions import BC as default_bc
+from config.fluid_properties import fluid as default_fluid
+from methods.initialization.initialize_fields import wall_velocity
+from methods.solver import solve_cavity
+from methods.solver_psi_omega import solve_cavity_psi_omega
+from methods.solver_lbm import solve_cavity_lbm
+from methods.result_store import ResultStore, cached_solve
+
+SOLVERS = {
+    "projection": solve_cavity,
+    "psi_omega": solve_cavity_psi_omega,
+    "lbm": solve_cavity_lbm,
+}
+
+
+def set_path(config, path, value):
+    """
+    Set config["a"]["b"]["c"] = value for path "a.b.c".
+    """
+    *parents, last = path.split(".")
+    node = config
+    for name in parents:
+        node = node.setdefault(name, {})
+    node[last] = value
+
+
+def expand_cases(spec):
+    """
+    Build the list of cases of a sweep spec.
+
+    Returns
+    -------
+    list of dict
+        Each with 'name', 'overrides', 'domain', 'fluid', 'bc'
+    """
+    base = spec.get("base", {})
+    base = {
+        "domain": base.get("domain", default_domain),
+        "fluid": base.get("fluid", default_fluid),
+        "bc": base.get("bc", default_bc),
+    }
+
+    grid = spec.get("grid", {})
+    zipped = spec.get("zip", [])
+    for path in zipped:
+        if path not in grid:
+            raise ValueError(f"Zipped key '{path}' is not in the grid")
+    if zipped and len({len(grid[p]) for p in zipped}) != 1:
+        raise ValueError("Zipped grid entries must have equal length")
+
+    # Zipped keys form one axis, every other key its own axis
+    axes = []
+    if zipped:
+        axes.append([dict(zip(zipped, values)) for values in zip(*(grid[p] for p in zipped))])
+    for path, values in grid.items():
+        if path not in zipped:
+            axes.append([{path: value} for value in values])
+
+    cases = []
+    for i, combo in enumerate(itertools.product(*axes)):
+        overrides = {}
+        for part in combo:
+            overrides.update(part)
+
+        config = copy.deepcopy(base)
+        for path, value in overrides.items():
+            if path.split(".")[0] not in config:
+                raise ValueError(f"Override '{path}' must start with domain, fluid or bc")
+            set_path(config, path, value)
+
+        cases.append(dict(config, name=f"case_{i:04d}", overrides=overrides))
+    return cases
+
+
+def time_step(domain, bc):
+    """
+    Time step and final time from the Courant number, as in run.py but
+    based on the largest wall speed |(u, v)| in any direction.
+    """
+    dx = domain["lx"] / (domain["nx"] - 1)
+    courant = domain.get("courant", 0.5)
+    Umax = max((float(np.hypot(*wall_velocity(w, s))) for w, s in bc.items()), default=0.0) or 1.0
+    dt = courant * dx / Umax
+    nt = domain.get("nt", 500)
+    return dt, dt * nt
+
+
+def case_cost(case):
+    """
+    Estimated cost (cell updates) used for longest-first ordering.
+    """
+    domain = case["domain"]
+    return domain["nx"] * domain["ny"] * domain.get("nt", 500)
+
+
+def run_case(task):
+    """
+    Worker: solve one case and write its result file. Returns index record.
+    """
+    case, solver_name, options, out_dir, cache_dir = task
+    solver = SOLVERS[solver_name]
+    dt, t_final = time_step(case["domain"], case["bc"])
+
+    start = time.perf_counter()
+    record = {"name": case["name"], "overrides": case["overrides"],
+              "dt": dt, "t_final": t_final}
+    try:
+        if cache_dir is not None:
+            store = ResultStore(cache_dir)
+            results = cached_solve(store, case["domain"], case["fluid"], case["bc"],
+                                   dt, t_final, solver=solver, **options)
+        else:
+            results = solver(case["domain"], case["fluid"], case["bc"],
+                             dt, t_final, **options)
+    except Exception as exc:
+        record.update(status="failed", error=repr(exc),
+                      seconds=time.perf_counter() - start)
+        return record
+
+    path = os.path.join(out_dir, f"{case['name']}.npz")
+    np.savez_compressed(path, u=results["u"], v=results["v"], p=results["p"],
+                        x=results["x"], y=results["y"])
+    record.update(status="ok", file=os.path.basename(path),
+                  seconds=time.perf_counter() - start)
+    return record
+
+
+def _pin_threads():
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(1)
+
+
+def run_sweep(spec, out_dir, workers=None, cache_dir=None):
+    """
+    Run every case of a sweep spec on a process pool.
+
+    Parameters
+    ----------
+    spec : dict
+        Sweep specification (see module docstring)
+    out_dir : str
+        Output directory for result files and index.jsonl
+    workers : int, optional
+        Pool size, defaults to os.cpu_count()
+    cache_dir : str, optional
+        ResultStore directory; cached cases are not recomputed
+
+    Returns
+    -------
+    records : list of dict
+        Index records in completion order
+    """
+    solver_name = spec.get("solver", "projection")
+    if solver_name not in SOLVERS:
+        raise ValueError(f"Unknown solver: {solver_name}")
+    options = spec.get("options", {})
+
+    cases = sorted(expand_cases(spec), key=case_cost, reverse=True)
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(case, solver_name, options, out_dir, cache_dir) for case in cases]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    records = []
+    index_path = os.path.join(out_dir, "index.jsonl")
+    with open(index_path, "a") as index, \
+            mp.Pool(workers, initializer=_pin_threads) as pool:
+        for record in pool.imap_unordered(run_case, tasks):
+            index.write(json.dumps(record) + "\n")
+            index.flush()
+            records.append(record)
+            print(f"[{len(records)}/{len(tasks)}] {record['name']} "
+                  f"{record['status']} ({record['seconds']:.1f} s)", flush=True)
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a cavity flow parameter sweep.")
+    parser.add_argument("spec", help="sweep spec JSON file")
+    parser.add_argument("--out", default="sweep_results", help="output directory")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: all cores)")
+    parser.add_argument("--cache", default=None, help="result store directory")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as fh:
+        spec = json.load(fh)
+
+    records = run_sweep(spec, args.out, workers=args.workers, cache_dir=args.cache)
+    failed = [r for r in records if r["status"] != "ok"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())